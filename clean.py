@@ -1,55 +1,78 @@
+import argparse
 import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+
+def positive_int(value):
+    """argparse type for an integer of at least 1."""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {value}")
+    return number
+
+
+parser = argparse.ArgumentParser(description='Delete .ply results that have no matching prompt in prompts.txt')
+parser.add_argument(
+    '--workers',
+    type=positive_int,
+    default=16,
+    help='Number of threads used to delete files (default: 16)'
+)
+parser.add_argument(
+    '--quiet',
+    action='store_true',
+    help='Do not list every file that is going to be deleted'
+)
+args = parser.parse_args()
 
 # Read prompts.txt and extract base filenames
-with open('prompts.txt', 'r') as f:
-    lines = f.readlines()
+lines = Path('prompts.txt').read_text(encoding='utf-8').splitlines()
 
 # Extract filenames from URLs (remove extension and domain)
-prompt_files = set()
-for line in lines:
-    line = line.strip()
-    if line:
-        # Extract filename from URL
-        filename = line.split('/')[-1]
-        # Remove extension (.png)
-        base_name = filename.rsplit('.', 1)[0]
-        prompt_files.add(base_name)
+prompt_files = frozenset(
+    line.rsplit('/', 1)[-1].rsplit('.', 1)[0]
+    for line in lines
+    if line
+)
 
 print(f"Found {len(prompt_files)} unique files in prompts.txt\n")
 
-# List all .ply files in results folder
+# Scan the results folder once, classifying .ply files and summing the size of the ones to delete
+# (files in results but not in prompts)
 results_folder = '/root/results'
-result_files = [f for f in os.listdir(results_folder) if f.endswith('.ply')]
-
-print(f"Found {len(result_files)} .ply files in results folder\n")
-
-# Find files to delete (in results but not in prompts)
+result_count = 0
 files_to_delete = []
-for ply_file in result_files:
-    base_name = ply_file.rsplit('.', 1)[0]  # Remove .ply extension
-    if base_name not in prompt_files:
-        files_to_delete.append(ply_file)
+total_bytes = 0
+with os.scandir(results_folder) as it:
+    for entry in it:
+        if not entry.is_file(follow_symlinks=False) or not entry.name.endswith('.ply'):
+            continue
+        result_count += 1
+        if entry.name[:-4] not in prompt_files:  # Strip the known .ply extension
+            size = entry.stat().st_size
+            files_to_delete.append((entry.name, entry.path, size))
+            total_bytes += size
+
+print(f"Found {result_count} .ply files in results folder\n")
 
 if files_to_delete:
     print(f"Files to DELETE ({len(files_to_delete)}):")
-    for f in sorted(files_to_delete):
-        file_path = os.path.join(results_folder, f)
-        file_size = os.path.getsize(file_path) / (1024 * 1024)  # Size in MB
-        print(f"  - {f} ({file_size:.1f} MB)")
+    if not args.quiet:
+        sys.stdout.write('\n'.join(f"  - {name} ({size / (1024 * 1024):.1f} MB)" for name, _, size in sorted(files_to_delete)))
+        sys.stdout.write('\n')
     
-    print(f"\nTotal size to free: {sum(os.path.getsize(os.path.join(results_folder, f)) for f in files_to_delete) / (1024 * 1024):.1f} MB")
+    print(f"\nTotal size to free: {total_bytes / (1024 * 1024):.1f} MB")
     
     # Delete the files
     print("\nDeleting files...")
-    for f in files_to_delete:
-        file_path = os.path.join(results_folder, f)
-        os.remove(file_path)
-        print(f"  ✓ Deleted {f}")
+    with ThreadPoolExecutor(max_workers=args.workers) as executor:
+        list(executor.map(os.remove, (path for _, path, _ in files_to_delete)))
     
     print(f"\n✓ Successfully deleted {len(files_to_delete)} files")
 else:
     print("No files to delete - all files in results folder exist in prompts.txt")
 
 # Show remaining files
-remaining = [f for f in os.listdir(results_folder) if f.endswith('.ply')]
-print(f"\nRemaining files in results folder: {len(remaining)}")
\ No newline at end of file
+print(f"\nRemaining files in results folder: {result_count - len(files_to_delete)}")
@@ -1,12 +1,20 @@
 import asyncio
-import json
+import functools
+import heapq
+import math
+import os
 import sys
+import time
+from operator import itemgetter
 from pathlib import Path
-from typing import Callable
+from typing import Any, Callable, Coroutine, Iterator, TypeVar
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
 
 import click
 from loguru import logger
+from pydantic import ValidationError
 from targon_client import TargonClient, ContainerDeployConfig
 from targon_utils import ensure_running_container
 from generator import Generator
@@ -15,6 +23,11 @@ from targon.client.serverless import ServerlessResourceListItem
 from judge import Judge
 from models import State, Schedule
 
+try:
+    import uvloop
+except ImportError:  # uvloop does not support Windows
+    uvloop = None
+
 
 _GENERATOR_POD_NAME: str = "generator"
 _GENERATOR_PORT: int = 10006
@@ -27,15 +40,24 @@ _JUDGE_POD_NAME: str = "judge"
 _JUDGE_PORT: int = 8000
 _JUDGE_HEALTH_CHECK_PATH: str = "/health"
 _JUDGE_IMAGE_URL: str = "vllm/vllm-openai:latest"
+_JUDGE_MAX_NUM_SEQS: int = 4
 _JUDGE_ARGS: list[str] = [
     "--model", "zai-org/GLM-4.1V-9B-Thinking",
     "--max-model-len", "8096",
     "--tensor-parallel-size", "1",
     "--gpu-memory-utilization", "0.95",
-    "--max-num-seqs", "4",
+    "--max-num-seqs", str(_JUDGE_MAX_NUM_SEQS),
 ]
 _JUDGE_MODEL: str = "zai-org/GLM-4.1V-9B-Thinking"
 _GITHUB_URL: str = "https://raw.githubusercontent.com/404-Repo/404-active-competition/main"
+_CACHE_DIR: Path = Path.home() / ".cache" / "404-cli"
+_STATE_CACHE_TTL: float = 30.0
+
+_T = TypeVar("_T")
+
+# One pooled session so back-to-back state/schedule fetches reuse the TLS connection to GitHub
+_HTTP = requests.Session()
+_HTTP.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=8))
 
 
 @click.group()
@@ -48,49 +70,124 @@ def cli(verbose: int) -> None:
     logger.add(sys.stderr, level=levels.get(verbose, "TRACE"))
 
 
+def _run(coro: Coroutine[Any, Any, _T]) -> _T:
+    """Run a coroutine to completion on uvloop when it is available, otherwise on the default asyncio loop."""
+    if uvloop is not None:
+        return uvloop.run(coro)
+    return asyncio.run(coro)
+
+
+def _emit(result: dict) -> None:
+    """Write one JSON result line to stdout."""
+    out = click.get_binary_stream("stdout")
+    out.write(orjson.dumps(result, option=orjson.OPT_APPEND_NEWLINE))
+    out.flush()
+
+
+def _emit_error(error: str) -> None:
+    """Write a failed JSON result line to stdout."""
+    _emit({"success": False, "error": error})
+
+
+def _get_bt():
+    """Return the bittensor module, importing it on first use."""
+    import bittensor # Bittensor import should be here because bittensor captures command line args for click otherwise
+    return bittensor
+
+
+def _load_wallet(*, name: str, hotkey: str, path: str | None):
+    """Build a wallet and load its hotkey, so a missing or unreadable keyfile fails before any network call."""
+    wallet = _get_bt().wallet(name=name, hotkey=hotkey, path=path)
+    wallet.hotkey  # Accessing the hotkey reads and decodes its keyfile
+    return wallet
+
+
+def _read_cache(name: str, ttl: float | None) -> bytes | None:
+    """Return the cached file contents if present and younger than ttl seconds (None never expires)."""
+    path = _CACHE_DIR / name
+    try:
+        if ttl is not None and time.time() - path.stat().st_mtime > ttl:
+            return None
+        return path.read_bytes()
+    except OSError:
+        return None
+
+
+def _write_cache(name: str, content: bytes) -> None:
+    """Atomically store content in the cache; failures only cost the next fetch."""
+    try:
+        _CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp_path = _CACHE_DIR / f"{name}.{os.getpid()}.tmp"
+        tmp_path.write_bytes(content)
+        os.replace(tmp_path, _CACHE_DIR / name)
+    except OSError as e:
+        logger.debug(f"Failed to cache {name}: {e}")
+
+
+def _cached_fetch(url: str, cache_name: str, ttl: float | None, parse: Callable[[bytes], _T]) -> _T:
+    """Parse the cached copy of url while it is fresh, otherwise download, parse and cache it."""
+    if (cached := _read_cache(cache_name, ttl)) is not None:
+        try:
+            return parse(cached)
+        except ValidationError:
+            logger.debug(f"Ignoring invalid cached {cache_name}")
+    response = _HTTP.get(url, timeout=10)
+    response.raise_for_status()
+    # Validate the raw body in one pass instead of decoding to a dict first
+    result = parse(response.content)
+    _write_cache(cache_name, response.content)
+    return result
+
+
 def _fetch_state() -> State:
-    """Download and parse state.json from GitHub."""
+    """Download and parse state.json from GitHub, reusing a copy cached in the last few seconds."""
     state_url = f"{_GITHUB_URL}/state.json"
     try:
-        response = requests.get(state_url, timeout=10)
-        response.raise_for_status()
-        # response.json() already returns a dict; use model_validate for dict input
-        return State.model_validate(response.json())
+        return _cached_fetch(state_url, "state.json", _STATE_CACHE_TTL, State.model_validate_json)
     except requests.RequestException as e:
         logger.error(f"Failed to fetch state.json: {e}")
         raise RuntimeError(f"Failed to fetch state.json from {state_url}: {str(e)}")
-    except json.JSONDecodeError as e:
+    except ValidationError as e:
         logger.error(f"Failed to parse state.json: {e}")
         raise RuntimeError(f"Failed to parse state.json: {str(e)}")
 
 
+def _prefetch_schedule(round_number: int) -> Schedule | None:
+    """Fetch schedule.json for a round that may not be published yet; failures return None without logging."""
+    schedule_url = f"{_GITHUB_URL}/rounds/{round_number}/schedule.json"
+    try:
+        return _cached_fetch(schedule_url, f"schedule-{round_number}.json", None, Schedule.model_validate_json)
+    except (requests.RequestException, ValidationError):
+        return None
+
+
+@functools.lru_cache(maxsize=None)
 def _fetch_schedule(round_number: int) -> Schedule:
-    """Download and parse schedule.json from GitHub for a specific round."""
+    """Download and parse schedule.json from GitHub for a specific round.
+
+    Published schedules do not change, so they are cached on disk without expiry.
+    """
     schedule_url = f"{_GITHUB_URL}/rounds/{round_number}/schedule.json"
     try:
-        response = requests.get(schedule_url, timeout=10)
-        response.raise_for_status()
-        return Schedule.model_validate(response.json())
+        return _cached_fetch(schedule_url, f"schedule-{round_number}.json", None, Schedule.model_validate_json)
     except requests.RequestException as e:
         logger.error(f"Failed to fetch schedule.json for round {round_number}: {e}")
         raise RuntimeError(f"Failed to fetch schedule.json from {schedule_url}: {str(e)}")
-    except json.JSONDecodeError as e:
+    except ValidationError as e:
         logger.error(f"Failed to parse schedule.json for round {round_number}: {e}")
         raise RuntimeError(f"Failed to parse schedule.json: {str(e)}")
 
 
 async def _fetch_and_parse_commitments(
-    subtensor_endpoint: str,
+    subtensor,
     netuid: int,
     round_number: int,
     schedule: Schedule,
     current_round: int,
 ) -> dict[str, dict]:
-    """Fetch commitments from subtensor and parse them for a specific round."""
-    import bittensor as bt # Bittensor import should be here because bittensor captures command line args for click otherwise
-    async with bt.async_subtensor(subtensor_endpoint) as subtensor:
-        raw_commitments = await subtensor.get_all_revealed_commitments(netuid=netuid)
-        return _parse_commitments(raw_commitments, round_number, schedule, current_round)
+    """Fetch commitments over an already open subtensor connection and parse them for a specific round."""
+    raw_commitments = await subtensor.get_all_revealed_commitments(netuid=netuid)
+    return _parse_commitments(raw_commitments, round_number, schedule, current_round)
 
 
 @cli.command("commit-hash")
@@ -111,59 +208,27 @@ def commit_hash_cmd(
     wallet_path: str | None,
 ) -> None:
     """Commit revision hash on-chain."""
-    import bittensor as bt # Bittensor import should be here because bittensor captures command line args for click otherwise
-        
-    try: 
-        state = _fetch_state()
-    except Exception as e:
-        click.echo(json.dumps({"success": False, "error": f"Failed to fetch state: {str(e)}"}))
-        raise SystemExit(1)
-
-    try:
-        schedule = _fetch_schedule(state.current_round)
-    except Exception as e:
-        click.echo(json.dumps({"success": False, "error": f"Failed to fetch schedule: {str(e)}"}))
-        raise SystemExit(1)
 
     try:
-        current_block = asyncio.run(bt.async_subtensor(subtensor_endpoint).get_current_block())
-        if current_block < schedule.earliest_reveal_block:
-            click.echo(json.dumps({"success": False, "error": f"Current block {current_block} is before the earliest reveal block {schedule.earliest_reveal_block}"}))
-            raise SystemExit(1)
+        wallet = _load_wallet(name=wallet_name, hotkey=wallet_hotkey, path=wallet_path)
     except Exception as e:
-        click.echo(json.dumps({"success": False, "error": f"Failed to fetch current block: {str(e)}"}))
+        _emit_error(f"Failed to load wallet: {str(e)}")
         raise SystemExit(1)
 
-    round_to_commit = state.current_round if current_block <= schedule.latest_reveal_block else state.current_round + 1
     try:
-        commitments = asyncio.run(
-            _fetch_and_parse_commitments(
-                subtensor_endpoint=subtensor_endpoint,
+        _run(
+            _prepare_and_commit(
+                data={"commit": commit_hash},
                 netuid=netuid,
-                round_number=round_to_commit,
-                schedule=schedule,
-                current_round=state.current_round,
+                subtensor_endpoint=subtensor_endpoint,
+                wallet=wallet,
+                require_hash=False,
             )
         )
-        wallet = bt.wallet(name=wallet_name, hotkey=wallet_hotkey, path=wallet_path)
-        hotkey = wallet.hotkey.ss58_address
-        if hotkey not in commitments:
-            click.echo(f"WARNING: You have not commited repo and cdn_url for round {round_to_commit}.", err=True)
-        elif not commitments[hotkey]["repo"] or not commitments[hotkey]["cdn_url"]:
-            click.echo(f"WARNING: You have not commited repo and cdn_url for round {round_to_commit}.", err=True)
     except Exception as e:
-        click.echo(f"WARNING: Failed to fetch information about your commitments in round {round_to_commit}: {str(e)}", err=True)
-        
-    _run_commit(
-        data={"commit": commit_hash},
-        netuid=netuid,
-        subtensor_endpoint=subtensor_endpoint,
-        wallet_name=wallet_name,
-        wallet_hotkey=wallet_hotkey,
-        wallet_path=wallet_path,
-        state=state,
-        current_round=round_to_commit,
-    )
+        logger.error(f"Commit failed: {e}")
+        _emit_error(str(e))
+        raise SystemExit(1)
 
 
 @cli.command("commit-repo-cdn")
@@ -190,102 +255,300 @@ def commit_repo_cdn_cmd(
     wallet_path: str | None,
 ) -> None:
     """Commit repo and CDN URL on-chain."""
-    import bittensor as bt # Bittensor import should be here because bittensor captures command line args for click otherwise
-        
-    try: 
-        state = _fetch_state()
+
+    try:
+        wallet = _load_wallet(name=wallet_name, hotkey=wallet_hotkey, path=wallet_path)
     except Exception as e:
-        click.echo(json.dumps({"success": False, "error": f"Failed to fetch state: {str(e)}"}))
+        _emit_error(f"Failed to load wallet: {str(e)}")
         raise SystemExit(1)
 
     try:
-        schedule = _fetch_schedule(state.current_round)
+        _run(
+            _prepare_and_commit(
+                data={"repo": repo, "cdn_url": cdn_url},
+                netuid=netuid,
+                subtensor_endpoint=subtensor_endpoint,
+                wallet=wallet,
+                require_hash=True,
+            )
+        )
     except Exception as e:
-        click.echo(json.dumps({"success": False, "error": f"Failed to fetch schedule: {str(e)}"}))
+        logger.error(f"Commit failed: {e}")
+        _emit_error(str(e))
         raise SystemExit(1)
 
-    try:
-        current_block = asyncio.run(bt.async_subtensor(subtensor_endpoint).get_current_block())
+
+async def _prepare_and_commit(
+    *,
+    data: dict,
+    netuid: int,
+    subtensor_endpoint: str,
+    wallet,
+    require_hash: bool,
+) -> None:
+    """Check the round and the hotkey's commitments in it, then commit data, all over one subtensor connection.
+
+    With require_hash the hotkey must already have committed a hash for the round;
+    otherwise a missing repo/cdn_url is only reported as a warning.
+    """
+    bt = _get_bt()
+    async with bt.async_subtensor(subtensor_endpoint) as subtensor:
+        # state.json comes over HTTP in a worker thread while the chain is asked for the current block
+        state, current_block = await asyncio.gather(
+            asyncio.to_thread(_fetch_state),
+            subtensor.get_current_block(),
+            return_exceptions=True,
+        )
+        if isinstance(state, Exception):
+            _emit_error(f"Failed to fetch state: {str(state)}")
+            raise SystemExit(1)
+
+        try:
+            schedule = await asyncio.to_thread(_fetch_schedule, state.current_round)
+        except Exception as e:
+            _emit_error(f"Failed to fetch schedule: {str(e)}")
+            raise SystemExit(1)
+
+        if isinstance(current_block, Exception):
+            _emit_error(f"Failed to fetch current block: {str(current_block)}")
+            raise SystemExit(1)
         if current_block < schedule.earliest_reveal_block:
-            click.echo(json.dumps({"success": False, "error": f"Current block {current_block} is before the earliest reveal block {schedule.earliest_reveal_block}"}))
+            _emit_error(f"Current block {current_block} is before the earliest reveal block {schedule.earliest_reveal_block}")
             raise SystemExit(1)
-    except Exception as e:
-        click.echo(json.dumps({"success": False, "error": f"Failed to fetch current block: {str(e)}"}))
-        raise SystemExit(1)
 
-    round_to_commit = state.current_round if current_block <= schedule.latest_reveal_block else state.current_round + 1
-    try:
-        commitments = asyncio.run(
-            _fetch_and_parse_commitments(
-                subtensor_endpoint=subtensor_endpoint,
+        round_to_commit = state.current_round if current_block <= schedule.latest_reveal_block else state.current_round + 1
+        try:
+            commitments = await _fetch_and_parse_commitments(
+                subtensor=subtensor,
                 netuid=netuid,
                 round_number=round_to_commit,
                 schedule=schedule,
                 current_round=state.current_round,
             )
+        except Exception as e:
+            if require_hash:
+                _emit_error(f"Failed to fetch information about your commitments in round {round_to_commit}: {str(e)}")
+                raise SystemExit(1)
+            click.echo(f"WARNING: Failed to fetch information about your commitments in round {round_to_commit}: {str(e)}", err=True)
+        else:
+            commitment = commitments.get(wallet.hotkey.ss58_address)
+            if require_hash:
+                if not commitment or not commitment["commit_hash"]:
+                    _emit_error(f"You have not committed hash for round {round_to_commit}. Please commit hash first.")
+                    raise SystemExit(1)
+            elif not commitment or not commitment["repo"] or not commitment["cdn_url"]:
+                click.echo(f"WARNING: You have not commited repo and cdn_url for round {round_to_commit}.", err=True)
+
+        await _run_commit(
+            subtensor,
+            data=data,
+            netuid=netuid,
+            wallet=wallet,
+            current_round=round_to_commit,
         )
-        wallet = bt.wallet(name=wallet_name, hotkey=wallet_hotkey, path=wallet_path)
-        hotkey = wallet.hotkey.ss58_address
-        if hotkey not in commitments:
-            click.echo(json.dumps({"success": False, "error": f"You have not committed hash for round {round_to_commit}. Please commit hash first."}))
-            raise SystemExit(1)
-        elif not commitments[hotkey]["commit_hash"]:
-            click.echo(json.dumps({"success": False, "error": f"You have not committed hash for round {round_to_commit}. Please commit hash first."}))
-            raise SystemExit(1)
-    except SystemExit:
-        raise
+
+
+async def _run_commit(
+    subtensor,
+    *,
+    data: dict,
+    netuid: int,
+    wallet,
+    current_round: int,
+) -> None:
+    logger.info(f"Committing {data} with wallet {wallet.name}@{wallet.hotkey_str}")
+    try:
+        block = await _submit_commitment(subtensor, wallet=wallet, netuid=netuid, data=data)
+        click.echo(f"Committed at block {block}")
+        data["round"] = current_round
+        _emit({"success": True, **data})
     except Exception as e:
-        click.echo(json.dumps({"success": False, "error": f"Failed to fetch information about your commitments in round {round_to_commit}: {str(e)}"}))
+        logger.error(f"Commit failed: {e}")
+        _emit_error(str(e))
         raise SystemExit(1)
 
-    _run_commit(
-        data={"repo": repo, "cdn_url": cdn_url},
+
+async def _submit_commitment(subtensor, *, wallet, netuid: int, data: dict) -> int:
+    """Submit a reveal commitment over an already open subtensor connection and return its block."""
+    payload = orjson.dumps(data).decode()
+    success, block = await subtensor.set_reveal_commitment(
+        wallet=wallet,
         netuid=netuid,
-        subtensor_endpoint=subtensor_endpoint,
-        wallet_name=wallet_name,
-        wallet_hotkey=wallet_hotkey,
-        wallet_path=wallet_path,
-        state=state,
-        current_round=round_to_commit,
+        data=payload,
+        blocks_until_reveal=2,
     )
+    if not success:
+        raise RuntimeError(f"Commitment failed at block {block}")
+    return block
 
 
-def _run_commit(
-    *,
-    data: dict,
+@cli.command("batch")
+@click.option("--netuid", default=17, show_default=True)
+@click.option(
+    "--subtensor.endpoint", "subtensor_endpoint", default="finney", show_default=True
+)
+@click.option("--wallet.name", "wallet_name", required=True, help="Name of the bittensor wallet to use")
+@click.option("--wallet.hotkey", "wallet_hotkey", required=True, help="Hotkey name of the wallet")
+@click.option("--wallet.path", "wallet_path", default=None, help="Path to the wallet directory (default: ~/.bittensor)")
+def batch_cmd(
     netuid: int,
     subtensor_endpoint: str,
     wallet_name: str,
     wallet_hotkey: str,
     wallet_path: str | None,
-    state: State,
-    current_round: int,
 ) -> None:
-    import bittensor as bt # Bittensor import should be here because bittensor captures --help command otherwise
-    wallet = bt.wallet(name=wallet_name, hotkey=wallet_hotkey, path=wallet_path)
-    logger.info(f"Committing {data} with wallet {wallet_name}@{wallet_hotkey}")
+    """Run NDJSON commands from stdin over a single subtensor connection.
 
-    async def _commit() -> None:
-        async with bt.async_subtensor(subtensor_endpoint) as subtensor:
-            payload = json.dumps(data)
-            success, block = await subtensor.set_reveal_commitment(
-                wallet=wallet,
-                netuid=netuid,
-                data=payload,
-                blocks_until_reveal=2,
+    Each input line is either {"command": "commit", "data": {...}} or
+    {"command": "list", "round": <round>}, and one JSON result line is
+    written per command. Commit payloads are submitted as given, without
+    the round checks done by commit-hash and commit-repo-cdn.
+    """
+    bt = _get_bt()
+
+    try:
+        wallet = _load_wallet(name=wallet_name, hotkey=wallet_hotkey, path=wallet_path)
+    except Exception as e:
+        _emit_error(f"Failed to load wallet: {str(e)}")
+        raise SystemExit(1)
+
+    async def _handle(subtensor, request: dict) -> dict:
+        command = request.get("command")
+        if command == "commit":
+            data = dict(request["data"])
+            block = await _submit_commitment(subtensor, wallet=wallet, netuid=netuid, data=data)
+            return {"success": True, "block": block, **data}
+        if command == "list":
+            round_number = int(request["round"])
+            state = await asyncio.to_thread(_fetch_state)
+            if round_number > state.current_round + 1:
+                raise RuntimeError(f"Round {round_number} is not yet revealed. Next round is {state.current_round + 1}.")
+            schedule = await asyncio.to_thread(_fetch_schedule, min(round_number, state.current_round))
+            commitments = await subtensor.get_all_revealed_commitments(netuid=netuid)
+            entries = sorted(
+                _iter_commitments(commitments, round_number, schedule, state.current_round),
+                key=itemgetter("commit_block"),
             )
-            if success:
-                click.echo(f"Committed at block {block}")
-            else:
-                raise RuntimeError(f"Commitment failed at block {block}")
+            return {"success": True, "round": round_number, "commitments": entries}
+        raise ValueError(f"Unknown command: {command}")
+
+    async def _batch() -> None:
+        async with bt.async_subtensor(subtensor_endpoint) as subtensor:
+            while line := await asyncio.to_thread(sys.stdin.readline):
+                if not line.strip():
+                    continue
+                try:
+                    result = await _handle(subtensor, orjson.loads(line))
+                except Exception as e:
+                    logger.error(f"Batch command failed: {e}")
+                    result = {"success": False, "error": str(e)}
+                _emit(result)
 
     try:
-        asyncio.run(_commit())
-        data["round"] = current_round
-        click.echo(json.dumps({"success": True, **data}))
+        _run(_batch())
+    except KeyboardInterrupt:
+        logger.warning("Batch interrupted by user")
+        _emit_error("Interrupted by user")
+        raise SystemExit(130)  # Standard exit code for SIGINT
+
+
+@cli.command("commit-many")
+@click.option(
+    "--file",
+    "rows_file",
+    required=True,
+    type=click.Path(exists=True, dir_okay=False),
+    help='JSONL file with one {"wallet", "hotkey", "commit"} or {"wallet", "hotkey", "repo", "cdn_url"} object per line',
+)
+@click.option(
+    "--concurrency",
+    default=8,
+    show_default=True,
+    type=click.IntRange(1, 100),
+    help="Maximum number of commitments submitted at once",
+)
+@click.option("--netuid", default=17, show_default=True)
+@click.option(
+    "--subtensor.endpoint", "subtensor_endpoint", default="finney", show_default=True
+)
+@click.option("--wallet.path", "wallet_path", default=None, help="Path to the wallet directory (default: ~/.bittensor)")
+def commit_many_cmd(
+    rows_file: str,
+    concurrency: int,
+    netuid: int,
+    subtensor_endpoint: str,
+    wallet_path: str | None,
+) -> None:
+    """Commit many payloads concurrently over a single subtensor connection.
+
+    Rows are submitted as given, without the round checks done by
+    commit-hash and commit-repo-cdn, and one JSON result line is written
+    per row in input order.
+    """
+    bt = _get_bt()
+
+    try:
+        rows = [orjson.loads(line) for line in Path(rows_file).read_text(encoding="utf-8").splitlines() if line.strip()]
+        if not all(isinstance(row, dict) for row in rows):
+            raise ValueError("every line must be a JSON object")
     except Exception as e:
-        logger.error(f"Commit failed: {e}")
-        click.echo(json.dumps({"success": False, "error": str(e)}))
+        _emit_error(f"Failed to read {rows_file}: {str(e)}")
+        raise SystemExit(1)
+
+    def _has_wallet(row: dict) -> bool:
+        return all(isinstance(row.get(k), str) and row[k] for k in ("wallet", "hotkey"))
+
+    # Load each distinct wallet once before connecting; rows whose wallet fails to load are reported without submitting.
+    # Rows without both wallet and hotkey are never loaded, so they cannot fall back to bittensor's default wallet.
+    wallets: dict[tuple, object] = {}
+    for row in rows:
+        if not _has_wallet(row):
+            continue
+        key = (row["wallet"], row["hotkey"])
+        if key not in wallets:
+            try:
+                wallets[key] = _load_wallet(name=key[0], hotkey=key[1], path=wallet_path)
+            except Exception as e:
+                wallets[key] = e
+
+    async def _one(subtensor, sem: asyncio.Semaphore, row: dict) -> dict:
+        if not _has_wallet(row):
+            raise ValueError("Row must contain both wallet and hotkey as non-empty strings")
+        # Only the commitment fields are submitted; any other keys in the row stay off chain
+        data = {k: row[k] for k in ("commit", "repo", "cdn_url") if k in row}
+        if not data.get("commit") and not (data.get("repo") and data.get("cdn_url")):
+            raise ValueError("Row must contain either commit or both repo and cdn_url")
+        wallet = wallets[(row["wallet"], row["hotkey"])]
+        if isinstance(wallet, Exception):
+            raise RuntimeError(f"Failed to load wallet: {wallet}")
+        async with sem:
+            block = await _submit_commitment(subtensor, wallet=wallet, netuid=netuid, data=data)
+        return {"success": True, "wallet": row["wallet"], "hotkey": row["hotkey"], "block": block, **data}
+
+    async def _bulk() -> list:
+        sem = asyncio.Semaphore(concurrency)
+        async with bt.async_subtensor(subtensor_endpoint) as subtensor:
+            return await asyncio.gather(*(_one(subtensor, sem, row) for row in rows), return_exceptions=True)
+
+    try:
+        results = _run(_bulk())
+    except KeyboardInterrupt:
+        logger.warning("Bulk commit interrupted by user")
+        _emit_error("Interrupted by user")
+        raise SystemExit(130)  # Standard exit code for SIGINT
+    except Exception as e:
+        logger.error(f"Bulk commit failed: {e}")
+        _emit_error(str(e))
+        raise SystemExit(1)
+
+    failed = 0
+    for row, result in zip(rows, results):
+        if isinstance(result, Exception):
+            failed += 1
+            logger.error(f"Commit failed for {row.get('wallet')}@{row.get('hotkey')}: {result}")
+            result = {"success": False, "wallet": row.get("wallet"), "hotkey": row.get("hotkey"), "error": str(result)}
+        _emit(result)
+    if failed:
         raise SystemExit(1)
 
 
@@ -294,95 +557,140 @@ def _run_commit(
 @click.option(
     "--subtensor.endpoint", "subtensor_endpoint", default="finney", show_default=True
 )
-def list_all_cmd(netuid: int, subtensor_endpoint: str) -> None:
+@click.option("--limit", type=click.IntRange(min=0), default=None, help="Only list the N earliest commitments by commit block")
+def list_all_cmd(netuid: int, subtensor_endpoint: str, limit: int | None) -> None:
     """List all revealed commitments."""
     # Ask user for round number interactively
     round_number: int = click.prompt("Enter round number", type=int)
     logger.info(f"Listing commitments for round {round_number}")
 
+    # The round is known before anything is fetched, so its schedule is fetched speculatively
+    # alongside state.json. The speculative fetch stays quiet when the schedule is not published yet;
+    # the schedule is fetched again, with errors reported, when the round turns out to be the next one
+    # or the speculative fetch failed.
+    async def _prefetch() -> list:
+        return await asyncio.gather(
+            asyncio.to_thread(_fetch_state),
+            asyncio.to_thread(_prefetch_schedule, round_number),
+            return_exceptions=True,
+        )
+
+    state, schedule = _run(_prefetch())
+
     # Case of the next round while current round is in progress should be handled here too.
-    try:
-        state = _fetch_state()
-        current_round = state.current_round
-        if round_number > current_round + 1:
-            click.echo(json.dumps({"success": False, "error": f"Round {round_number} is not yet revealed. Next round is {current_round + 1}."}))
-            raise SystemExit(1)
-    except Exception as e:
-        logger.error(f"Failed to fetch state: {e}")
-        click.echo(json.dumps({"success": False, "error": f"Failed to fetch state: {str(e)}"}))
+    if isinstance(state, Exception):
+        logger.error(f"Failed to fetch state: {state}")
+        _emit_error(f"Failed to fetch state: {str(state)}")
         raise SystemExit(1)
-    
+    current_round = state.current_round
+    if round_number > current_round + 1:
+        _emit_error(f"Round {round_number} is not yet revealed. Next round is {current_round + 1}.")
+        raise SystemExit(1)
+
     # Fetch schedule for the round.
     # If the round is the next round while current round is in progress, fetch the schedule for the current round.
     try:
         round_to_fetch = round_number if round_number <= current_round else current_round
-        schedule = _fetch_schedule(round_to_fetch)
+        if round_to_fetch != round_number or not isinstance(schedule, Schedule):
+            schedule = _fetch_schedule(round_to_fetch)
     except Exception as e:
         logger.error(f"Failed to fetch schedule: {e}")
-        click.echo(json.dumps({"success": False, "error": f"Failed to fetch schedule: {str(e)}"}))
+        _emit_error(f"Failed to fetch schedule: {str(e)}")
         raise SystemExit(1)
 
-    async def _list(round_number: int, schedule: Schedule, current_round: int) -> list[dict]:
-        import bittensor as bt # Bittensor import should be here because bittensor captures command line args for click otherwise
+    async def _list() -> dict:
+        bt = _get_bt()
         async with bt.async_subtensor(subtensor_endpoint) as subtensor:
-            commitments = await subtensor.get_all_revealed_commitments(netuid=netuid)
-            commitments_dict = _parse_commitments(commitments, round_number, schedule, current_round)
-            results_list = list(commitments_dict.values())
-            results_list.sort(key=lambda x: x["commit_block"])
-            return results_list
+            return await subtensor.get_all_revealed_commitments(netuid=netuid)
 
-    results = asyncio.run(_list(round_number, schedule, current_round))
-    for entry in results:
-        click.echo(json.dumps(entry))
+    commitments = _run(_list())
+    # Entries are parsed lazily; ordering them is the only step that needs all of them at once,
+    # and with --limit only the N earliest are kept on a heap instead of sorting everything.
+    entries = _iter_commitments(commitments, round_number, schedule, current_round)
+    if limit is not None:
+        entries = heapq.nsmallest(limit, entries, key=itemgetter("commit_block"))
+    else:
+        entries = sorted(entries, key=itemgetter("commit_block"))
+    out = click.get_binary_stream("stdout")
+    write = out.write
+    for entry in entries:
+        write(orjson.dumps(entry, option=orjson.OPT_APPEND_NEWLINE))
+    out.flush()
 
 
 def _parse_commitments(commitments: dict, round_number: int, schedule: Schedule, current_round: int) -> dict[str, dict]:
-    """Extract latest commit and repo for each hotkey, sorted by commit block."""
-    results: dict[str, dict] = {}
+    """Extract latest commit and repo for each hotkey, keyed by hotkey."""
+    return {entry["hotkey"]: entry for entry in _iter_commitments(commitments, round_number, schedule, current_round)}
+
+
+def _load_commitment(data: str) -> dict | None:
+    """Decode a commitment payload, returning None unless it is a JSON object."""
+    try:
+        parsed = orjson.loads(data)
+    except orjson.JSONDecodeError:
+        return None
+    return parsed if isinstance(parsed, dict) else None
+
+
+def _iter_commitments(commitments: dict, round_number: int, schedule: Schedule, current_round: int) -> Iterator[dict]:
+    """Yield the latest commit and repo of each hotkey that committed in the round, in subtensor order."""
+    # The round only decides the block window, so it is resolved once instead of per entry.
+    # Commitments to the next round are the ones made after the current round's reveal window.
+    if round_number == current_round + 1:
+        lower_block, upper_block = schedule.latest_reveal_block + 1, math.inf
+    elif round_number <= current_round:
+        lower_block, upper_block = schedule.earliest_reveal_block, schedule.latest_reveal_block
+    else:
+        lower_block, upper_block = -math.inf, math.inf
 
     for hotkey, entries in commitments.items():
-        latest_commit: tuple[int, str] | None = None
-        latest_repo: tuple[int, str] | None = None
-        latest_cdn_url: tuple[int, str] | None = None
+        commit_block = commit_hash = None
+        repo_block = repo = None
+        cdn_block = cdn_url = None
 
-        for block, data in entries:
-            if round_number == current_round + 1 and block <= schedule.latest_reveal_block:
+        # Walk newest first so the first match per field is the latest one and the scan can stop
+        # once all three are known. The sort is stable, so equal blocks keep their original order,
+        # and it is linear when subtensor already returns the entries in block order.
+        for block, data in sorted(entries, key=itemgetter(0), reverse=True):
+            if block > upper_block:
                 continue
-            if round_number <= current_round and (block < schedule.earliest_reveal_block or block > schedule.latest_reveal_block):
+            # Blocks only decrease from here, so falling below the window ends the scan
+            if block < lower_block:
+                break
+            if isinstance(data, dict):
+                # Some bittensor versions hand back payloads that are already decoded
+                parsed = data
+            # Payloads that cannot carry any tracked key are not worth decoding
+            elif '"commit"' not in data and '"repo"' not in data and '"cdn_url"' not in data:
                 continue
-            
-            try:
-                parsed = json.loads(data)
-            except json.JSONDecodeError:
+            elif (parsed := _load_commitment(data)) is None:
                 continue
 
-            if commit_hash := parsed.get("commit"):
-                if latest_commit is None or block > latest_commit[0]:
-                    latest_commit = (block, commit_hash)
+            if commit_hash is None and (value := parsed.get("commit")):
+                commit_block, commit_hash = block, value
 
-            if repo := parsed.get("repo"):
-                if latest_repo is None or block > latest_repo[0]:
-                    latest_repo = (block, repo)
+            if repo is None and (value := parsed.get("repo")):
+                repo_block, repo = block, value
 
-            if cdn_url := parsed.get("cdn_url"):
-                if latest_cdn_url is None or block > latest_cdn_url[0]:
-                    latest_cdn_url = (block, cdn_url)
+            if cdn_url is None and (value := parsed.get("cdn_url")):
+                cdn_block, cdn_url = block, value
 
-        if latest_commit is None:
+            if commit_hash is not None and repo is not None and cdn_url is not None:
+                break
+
+        if commit_hash is None:
             continue
 
-        results[hotkey] = {
+        yield {
             "hotkey": hotkey,
-            "commit_hash": latest_commit[1],
-            "commit_block": latest_commit[0],
-            "repo": latest_repo[1] if latest_repo else None,
-            "repo_block": latest_repo[0] if latest_repo else None,
-            "cdn_url": latest_cdn_url[1] if latest_cdn_url else None,
-            "cdn_block": latest_cdn_url[0] if latest_cdn_url else None,
+            "commit_hash": commit_hash,
+            "commit_block": commit_block,
+            "repo": repo,
+            "repo_block": repo_block,
+            "cdn_url": cdn_url,
+            "cdn_block": cdn_block,
         }
 
-    return results
-
 
 @cli.command("start-generator")
 @click.option("--image-url", required=True, help="URL of the generator image to start")
@@ -392,7 +700,7 @@ def start_generator_cmd(image_url: str, targon_api_key: str) -> None:
     click.echo(f"Starting generator: {image_url}", err=True)
     
     try:
-        container_url = asyncio.run(
+        container_url = _run(
             _create_container(
                 image_url=image_url,
                 container_name=_GENERATOR_POD_NAME,
@@ -403,14 +711,14 @@ def start_generator_cmd(image_url: str, targon_api_key: str) -> None:
                 echo=lambda msg: click.echo(msg, err=True),
             )
         )
-        click.echo(json.dumps({"success": True, "container_url": container_url}))
+        _emit({"success": True, "container_url": container_url})
     except KeyboardInterrupt:
         logger.warning("Generator start interrupted by user")
-        click.echo(json.dumps({"success": False, "error": "Interrupted by user"}))
+        _emit_error("Interrupted by user")
         raise SystemExit(130)  # Standard exit code for SIGINT
     except Exception as e:
         logger.error(f"Generator start failed: {e}")
-        click.echo(json.dumps({"success": False, "error": str(e)}))
+        _emit_error(str(e))
         raise SystemExit(1)
 
 
@@ -421,7 +729,7 @@ def start_renderer_cmd(targon_api_key: str) -> None:
     click.echo(f"Starting renderer: {_RENDER_IMAGE_URL}", err=True)
     
     try:
-        container_url = asyncio.run(
+        container_url = _run(
             _create_container(
                 image_url=_RENDER_IMAGE_URL,
                 container_name=_RENDER_POD_NAME,
@@ -432,14 +740,14 @@ def start_renderer_cmd(targon_api_key: str) -> None:
                 echo=lambda msg: click.echo(msg, err=True),
             )
         )
-        click.echo(json.dumps({"success": True, "container_url": container_url}))
+        _emit({"success": True, "container_url": container_url})
     except KeyboardInterrupt:
         logger.warning("Renderer start interrupted by user")
-        click.echo(json.dumps({"success": False, "error": "Interrupted by user"}))
+        _emit_error("Interrupted by user")
         raise SystemExit(130)  # Standard exit code for SIGINT
     except Exception as e:
         logger.error(f"Renderer start failed: {e}")
-        click.echo(json.dumps({"success": False, "error": str(e)}))
+        _emit_error(str(e))
         raise SystemExit(1)
 
 
@@ -447,20 +755,74 @@ def start_renderer_cmd(targon_api_key: str) -> None:
 @click.option("--data-dir", required=True, help="Path to the directory containing the .ply files to render")
 @click.option("--endpoint", required=True, help="Renderer endpoint URL.")
 @click.option("--output-dir", default="results", help="Path to the directory where the rendered images will be saved.")
-def render_cmd(data_dir: str, endpoint: str, output_dir: str) -> None:
+@click.option(
+    "--max-concurrency",
+    default=1,
+    show_default=True,
+    type=click.IntRange(1, 100),
+    help="Maximum number of files rendered at once. The start-renderer container serves one request at a time.",
+)
+@click.option("--r2-bucket", default=None, help="Upload rendered images to this R2 bucket instead of --output-dir.")
+@click.option("--r2-prefix", default="", help="Prefix (folder path) in the R2 bucket to upload to.")
+@click.option("--r2-account-id", envvar="R2_ACCOUNT_ID", default=None, help="Cloudflare account ID (or set R2_ACCOUNT_ID env var).")
+@click.option("--r2-access-key-id", envvar="R2_ACCESS_KEY_ID", default=None, help="R2 access key ID (or set R2_ACCESS_KEY_ID env var).")
+@click.option(
+    "--r2-secret-access-key",
+    envvar="R2_SECRET_ACCESS_KEY",
+    default=None,
+    help="R2 secret access key (or set R2_SECRET_ACCESS_KEY env var).",
+)
+def render_cmd(
+    data_dir: str,
+    endpoint: str,
+    output_dir: str,
+    max_concurrency: int,
+    r2_bucket: str | None,
+    r2_prefix: str,
+    r2_account_id: str | None,
+    r2_access_key_id: str | None,
+    r2_secret_access_key: str | None,
+) -> None:
     """Render the .ply files using the renderer endpoint."""
+    r2_client = None
+    if r2_bucket:
+        if not all([r2_account_id, r2_access_key_id, r2_secret_access_key]):
+            _emit_error("Missing R2 credentials: set --r2-account-id, --r2-access-key-id and --r2-secret-access-key")
+            raise SystemExit(1)
+        try:
+            from upload_r2_bucket import get_r2_client # boto3 is only needed when uploading to R2
+        except ImportError as e:
+            _emit_error(f"R2 upload needs the r2 extra (pip install '404-gen-commit[r2]'): {str(e)}")
+            raise SystemExit(1)
+        try:
+            r2_client = get_r2_client(r2_account_id, r2_access_key_id, r2_secret_access_key)
+        except Exception as e:
+            _emit_error(f"Failed to create R2 client: {str(e)}")
+            raise SystemExit(1)
+
     click.echo(f"Rendering {data_dir} with endpoint {endpoint}", err=True)
     try:
         renderer = Renderer(
             data_dir=data_dir,
             endpoint=endpoint,
             output_dir=output_dir,
+            max_concurrency=max_concurrency,
+            r2_client=r2_client,
+            r2_bucket=r2_bucket,
+            r2_prefix=r2_prefix,
         )
-        asyncio.run(renderer.render())
-        click.echo(json.dumps({"success": True, "output_dir": output_dir}))
+        _run(renderer.render())
+        if r2_bucket:
+            _emit({"success": True, "r2_bucket": r2_bucket, "r2_prefix": r2_prefix})
+        else:
+            _emit({"success": True, "output_dir": output_dir})
     except KeyboardInterrupt:
         logger.warning("Renderer interrupted by user")
-        click.echo(json.dumps({"success": False, "error": "Interrupted by user"}))
+        _emit_error("Interrupted by user")
+    except Exception as e:
+        logger.error(f"Renderer failed: {e}")
+        _emit_error(str(e))
+        raise SystemExit(1)
 
 
 @cli.command("start-judge")
@@ -469,7 +831,7 @@ def start_judge_cmd(targon_api_key: str) -> None:
     """Start the judge container."""
     click.echo(f"Starting judge: {_JUDGE_IMAGE_URL}", err=True)
     try:
-        container_url = asyncio.run(
+        container_url = _run(
             _create_container(
                 image_url=_JUDGE_IMAGE_URL,
                 container_name=_JUDGE_POD_NAME,
@@ -479,16 +841,17 @@ def start_judge_cmd(targon_api_key: str) -> None:
                 health_check_path=_JUDGE_HEALTH_CHECK_PATH,
                 echo=lambda msg: click.echo(msg, err=True),
                 args=_JUDGE_ARGS,
+                container_concurrency=_JUDGE_MAX_NUM_SEQS,
             )
         )
-        click.echo(json.dumps({"success": True, "container_url": container_url}))
+        _emit({"success": True, "container_url": container_url})
     except KeyboardInterrupt:
         logger.warning("Judge start interrupted by user")
-        click.echo(json.dumps({"success": False, "error": "Interrupted by user"}))
+        _emit_error("Interrupted by user")
         raise SystemExit(130)  # Standard exit code for SIGINT
     except Exception as e:
         logger.error(f"Judge start failed: {e}")
-        click.echo(json.dumps({"success": False, "error": str(e)}))
+        _emit_error(str(e))
         raise SystemExit(1)
 
     
@@ -499,6 +862,13 @@ def start_judge_cmd(targon_api_key: str) -> None:
 @click.option("--endpoint", required=True, help="Judge endpoint URL.")
 @click.option("--seed", required=True, help="Seed for generation.")
 @click.option("--output-file", default="duels.json", help="Path to the JSON file where duel results will be saved (default: duels.json).")
+@click.option(
+    "--max-concurrency",
+    default=_JUDGE_MAX_NUM_SEQS,
+    show_default=True,
+    type=click.IntRange(1, 100),
+    help="Maximum number of judge requests in flight at once.",
+)
 def judge_cmd(
     prompt_file: str,
     image_dir_1: str,
@@ -506,6 +876,7 @@ def judge_cmd(
     endpoint: str,
     seed: str,
     output_file: str,
+    max_concurrency: int,
 ) -> None:
     """Judge the two sets of images using the judge endpoint."""
     click.echo(f"Judging {prompt_file} with endpoint {endpoint}", err=True)
@@ -517,19 +888,19 @@ def judge_cmd(
             temperature=0.0,
             max_tokens=1024,
             timeout=30.0,
+            max_concurrency=max_concurrency,
         )
-        asyncio.run(judge.judge(Path(prompt_file), Path(image_dir_1), Path(image_dir_2), Path(output_file)))
-        click.echo(json.dumps({"success": True, "output_file": output_file}))
+        _run(judge.judge(Path(prompt_file), Path(image_dir_1), Path(image_dir_2), Path(output_file)))
+        _emit({"success": True, "output_file": output_file})
     except KeyboardInterrupt:
         logger.warning("Judge interrupted by user")
-        click.echo(json.dumps({"success": False, "error": "Interrupted by user"}))
+        _emit_error("Interrupted by user")
         raise SystemExit(130)  # Standard exit code for SIGINT
     except Exception as e:
         logger.error(f"Judge failed: {e}")
-        click.echo(json.dumps({"success": False, "error": str(e)}))
+        _emit_error(str(e))
         raise SystemExit(1)
-    finally:
-        click.echo(json.dumps({"success": True}))
+
 
 @cli.command("stop-pods")
 @click.option("--targon-api-key", required=True, help="Targon API key.")
@@ -544,14 +915,14 @@ def stop_pods_cmd(targon_api_key: str) -> None:
                     click.echo(f"Stopping container {c.name} ({c.uid})", err=True)
                     await targon.delete_container(c.uid)
     try:
-        asyncio.run(_stop())
+        _run(_stop())
     except KeyboardInterrupt:
         logger.warning("Pods stop interrupted by user")
-        click.echo(json.dumps({"success": False, "error": "Interrupted by user"}))
+        _emit_error("Interrupted by user")
         raise SystemExit(130)  # Standard exit code for SIGINT
     except Exception as e:
         logger.error(f"Pods stop failed: {e}")
-        click.echo(json.dumps({"success": False, "error": str(e)}))
+        _emit_error(str(e))
         raise SystemExit(1)
 
 
@@ -593,8 +964,8 @@ def generate_cmd(
     # Read prompts from prompt file
     click.echo("Reading prompts from file...", err=True)
     try:
-        with open(prompts_file, "r") as f:
-            prompts = [line.strip() for line in f.readlines() if line.strip()]
+        text = Path(prompts_file).read_text(encoding="utf-8")
+        prompts = [line for line in map(str.strip, text.splitlines()) if line]
     except FileNotFoundError:
         click.echo(f"Prompts file {prompts_file} not found", err=True)
         raise SystemExit(1)
@@ -628,11 +999,11 @@ def generate_cmd(
     )
     
     try:
-        asyncio.run(generator.generate_all(prompts))
-        click.echo(json.dumps({"success": True}))
+        _run(generator.generate_all(prompts))
+        _emit({"success": True})
     except KeyboardInterrupt:
         logger.warning("Generation interrupted by user")
-        click.echo(json.dumps({"success": False, "error": "Interrupted by user"}))
+        _emit_error("Interrupted by user")
         raise SystemExit(130)  # Standard exit code for SIGINT
     except Exception as e:
         click.echo(f"Generation failed: {e}", err=True)
@@ -648,6 +1019,7 @@ async def _create_container(
     health_check_path: str,
     echo: Callable[[str], None],
     args: list[str] | None = None,
+    container_concurrency: int = 1,
 ) -> str:
     """
     Create and deploy a container on Targon.
@@ -660,6 +1032,8 @@ async def _create_container(
         port: Port number for the container
         health_check_path: Health check endpoint path (e.g., "/health") or full URL
         echo: Callback function for logging messages
+        args: Extra arguments for the container entrypoint
+        container_concurrency: Requests Targon routes to the container at once
 
     Raises:
         RuntimeError: If container deployment fails
@@ -667,14 +1041,15 @@ async def _create_container(
     """
 
     container: ServerlessResourceListItem | None = None
-    try:
-        echo("Connecting to Targon...")
-        async with TargonClient(api_key=targon_api_key) as targon:
+    echo("Connecting to Targon...")
+    # The same client deploys the container and, on interrupt, deletes it again
+    async with TargonClient(api_key=targon_api_key) as targon:
+        try:
             config = ContainerDeployConfig(
                 image=image_url,
                 resource_name=resource_name,
                 port=port,
-                container_concurrency=1,
+                container_concurrency=container_concurrency,
                 args=args,
             )
             container = await ensure_running_container(
@@ -690,16 +1065,15 @@ async def _create_container(
                 return container.url
             else:
                 raise RuntimeError("Failed to deploy and start container")
-    except (KeyboardInterrupt, asyncio.CancelledError):
-        echo("\nInterrupted by user. Cleaning up...")
-        if container:
-            try:
-                async with TargonClient(api_key=targon_api_key) as targon:
+        except (KeyboardInterrupt, asyncio.CancelledError):
+            echo("\nInterrupted by user. Cleaning up...")
+            if container:
+                try:
                     await targon.delete_container(container.uid)
                     echo("Container deleted successfully")
-            except Exception as cleanup_error:
-                echo(f"Error during cleanup: {cleanup_error}")
-        raise
+                except Exception as cleanup_error:
+                    echo(f"Error during cleanup: {cleanup_error}")
+            raise
 
 
 if __name__ == "__main__":
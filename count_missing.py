@@ -15,59 +15,58 @@ def main():
     print("ANALYZING PROMPTS AND RESULTS")
     print("=" * 60)
     
-    with open(prompts_file, 'r') as f:
-        lines = f.readlines()
-    
     # Extract filenames from URLs (remove extension and domain)
     # Also keep a mapping of base_name -> full URL
-    prompt_files = set()
     prompt_urls = {}
-    for line in lines:
-        line = line.strip()
-        if line:
-            # Extract filename from URL
-            filename = line.split('/')[-1]
-            # Remove extension (.png)
-            base_name = filename.rsplit('.', 1)[0]
-            prompt_files.add(base_name)
-            prompt_urls[base_name] = line
+    with open(prompts_file, 'r') as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                # Extract filename from URL
+                filename = line.rpartition('/')[2]
+                # Remove extension (.png)
+                stem, dot, _ = filename.rpartition('.')
+                base_name = stem if dot else filename
+                prompt_urls[base_name] = line
     
-    print(f"\n📄 Total prompts in prompts.txt: {len(prompt_files)}")
+    print(f"\n📄 Total prompts in prompts.txt: {len(prompt_urls)}")
     
     # List all .ply files in results folder
     if os.path.exists(results_folder):
-        result_files = [f for f in os.listdir(results_folder) if f.endswith('.ply')]
-        result_base_names = {f.rsplit('.', 1)[0] for f in result_files}
+        # One scandir pass; sizes come from the DirEntry instead of a separate getsize() per file
+        with os.scandir(results_folder) as it:
+            result_files = {e.name[:-4]: e for e in it if e.name.endswith('.ply') and e.is_file()}
+        result_base_names = result_files.keys()
         
         print(f"📁 Total files in results folder: {len(result_files)}")
         
         # Calculate total size
-        total_size = sum(os.path.getsize(os.path.join(results_folder, f)) 
-                        for f in result_files) / (1024 * 1024)
+        total_size = sum(e.stat().st_size for e in result_files.values()) / (1024 * 1024)
         print(f"💾 Total size of results folder: {total_size:.1f} MB")
     else:
         print(f"❌ Results folder not found: {results_folder}")
-        result_base_names = set()
-        result_files = []
+        result_files = {}
+        result_base_names = result_files.keys()
     
     # Find prompts without corresponding files
-    missing_files = prompt_files - result_base_names
+    # A single pass over the prompts classifies each one against the results
+    missing_files = [k for k in prompt_urls if k not in result_base_names]
+    matched = len(prompt_urls) - len(missing_files)
     
     print(f"\n⚠️  Prompts WITHOUT corresponding files: {len(missing_files)}")
     
     # Write missing prompts to failed_prompts.txt
     if missing_files:
+        # Sorted once; both the file and the preview below use this order
+        missing_files.sort()
         with open(failed_prompts_file, 'w') as f:
-            for base_name in sorted(missing_files):
-                f.write(prompt_urls[base_name] + '\n')
+            f.write(''.join(prompt_urls[base_name] + '\n' for base_name in missing_files))
         print(f"📝 Written {len(missing_files)} missing prompts to: {failed_prompts_file}")
         
         print("\nMissing files (first 20):")
-        for i, base_name in enumerate(sorted(missing_files), 1):
-            print(f"  {i:3d}. {base_name}")
-            if i >= 20 and len(missing_files) > 20:
-                print(f"  ... and {len(missing_files) - 20} more")
-                break
+        print('\n'.join(f"  {i:3d}. {base_name}" for i, base_name in enumerate(missing_files[:20], 1)))
+        if len(missing_files) > 20:
+            print(f"  ... and {len(missing_files) - 20} more")
     else:
         # Remove failed_prompts.txt if it exists and there are no missing files
         if os.path.exists(failed_prompts_file):
@@ -75,28 +74,28 @@ def main():
         print("✅ No missing files!")
     
     # Find files without corresponding prompts
-    extra_files = result_base_names - prompt_files
+    # Every matched prompt is a distinct result file, so extras exist only if there are more results than matches
+    extra_files = result_base_names - prompt_urls.keys() if len(result_files) > matched else set()
     
-    print(f"\n✅ Prompts WITH corresponding files: {len(prompt_files) - len(missing_files)}")
+    print(f"\n✅ Prompts WITH corresponding files: {matched}")
     print(f"🔴 Files WITHOUT corresponding prompts: {len(extra_files)}")
     
     if extra_files:
         print("\nExtra files in results folder (not in prompts.txt):")
-        for i, base_name in enumerate(sorted(extra_files), 1):
-            file_path = os.path.join(results_folder, base_name + '.ply')
-            if os.path.exists(file_path):
-                size = os.path.getsize(file_path) / (1024 * 1024)
-                print(f"  {i}. {base_name}.ply ({size:.1f} MB)")
+        print('\n'.join(
+            f"  {i}. {base_name}.ply ({result_files[base_name].stat().st_size / (1024 * 1024):.1f} MB)"
+            for i, base_name in enumerate(sorted(extra_files), 1)
+        ))
     
     # Summary statistics
     print("\n" + "=" * 60)
     print("SUMMARY")
     print("=" * 60)
-    print(f"Total prompts:              {len(prompt_files)}")
+    print(f"Total prompts:              {len(prompt_urls)}")
     print(f"Total files in results:     {len(result_files)}")
-    print(f"Missing from results:       {len(missing_files)} ({len(missing_files)/len(prompt_files)*100:.1f}%)")
+    print(f"Missing from results:       {len(missing_files)} ({len(missing_files)/len(prompt_urls)*100:.1f}%)")
     print(f"Files without prompts:      {len(extra_files)}")
-    print(f"Match rate:                 {(len(prompt_files) - len(missing_files))/len(prompt_files)*100:.1f}%")
+    print(f"Match rate:                 {matched/len(prompt_urls)*100:.1f}%")
     print("=" * 60)
 
 if __name__ == "__main__":
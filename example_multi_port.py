@@ -132,7 +132,7 @@ async def main():
     print()
     print("Key Benefits of Multi-Port Setup:")
     print("  ✓ 4x throughput (4.8 requests/min vs 1.2 requests/min)")
-    print("  ✓ Automatic load balancing (round-robin)")
+    print("  ✓ Automatic load balancing (each request goes to the next free endpoint)")
     print("  ✓ Better GPU utilization")
     print("  ✓ Same latency per request (~45-50s)")
     print()
@@ -33,6 +33,10 @@ class Generator:
         # Create a queue of available endpoints for proper load balancing
         # Each endpoint can only handle one request at a time
         self.endpoint_queue: asyncio.Queue[str] | None = None
+
+        # HTTP clients shared by all prompts of a generate_all run, so connections are reused
+        self.download_client: httpx.AsyncClient | None = None
+        self.generate_client: httpx.AsyncClient | None = None
         
         self.seed = seed
         self.output_folder = Path(output_folder)
@@ -61,6 +65,12 @@ class Generator:
             KeyboardInterrupt: If interrupted by user
         """
         tasks = []
+        self.download_client = httpx.AsyncClient(
+            timeout=httpx.Timeout(connect=30.0, read=60.0, write=30.0, pool=30.0)
+        )
+        self.generate_client = httpx.AsyncClient(
+            timeout=httpx.Timeout(connect=30.0, read=300.0, write=30.0, pool=30.0)
+        )
         try:
             self.echo(f"Processing {len(prompts)} prompts...")
             
@@ -94,17 +104,19 @@ class Generator:
             self.echo("Generation completed")
         except (KeyboardInterrupt, asyncio.CancelledError):
             self.echo("\nInterrupted by user. Cancelling tasks and cleaning up...")
-            # Cancel all running tasks
-            for task in tasks:
-                if not task.done():
-                    task.cancel()
-            # Wait for tasks to be cancelled
-            if tasks:
-                await asyncio.gather(*tasks, return_exceptions=True)
+            # Cancel the tasks that are still running and wait only for those to unwind
+            pending = [task for task in tasks if not task.done()]
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
             raise
         except Exception as e:
             self.echo(f"Generation failed: {e}")
             raise
+        finally:
+            await self.download_client.aclose()
+            await self.generate_client.aclose()
 
     async def _process_prompt(
         self,
@@ -123,28 +135,26 @@ class Generator:
             RuntimeError: If generation fails
         """
         prompt_key = prompt.split("/")[-1].split(".")[0]
+        output_path = self.output_folder / f"{prompt_key}.ply"
 
         async with process_sem:
             # Download image from public URL
-            timeout = httpx.Timeout(connect=30.0, read=60.0, write=30.0, pool=30.0)
             self.echo(f"Downloading image from {prompt}...")
-            async with httpx.AsyncClient(timeout=timeout) as client:
-                response = await client.get(prompt)
-                response.raise_for_status()
-                image = response.content
-                result = await self._generate_with_retries(
-                    image=image,
-                    prompt_key=prompt_key,
-                )
-                if result is not None:
-                    self.echo(f"Prompt {prompt_key} generation successful")
-                else:
-                    self.echo(f"Prompt {prompt_key} generation failed")
-                    raise RuntimeError(f"Prompt {prompt_key} generation failed")
+            response = await self.download_client.get(prompt)
+            response.raise_for_status()
+            image = response.content
+            # The .ply file is streamed straight to the local filesystem
+            result = await self._generate_with_retries(
+                image=image,
+                prompt_key=prompt_key,
+                output_path=output_path,
+            )
+            if result is not None:
+                self.echo(f"Prompt {prompt_key} generation successful")
+            else:
+                self.echo(f"Prompt {prompt_key} generation failed")
+                raise RuntimeError(f"Prompt {prompt_key} generation failed")
 
-            # Save .ply file to local filesystem
-            output_path = self.output_folder / f"{prompt_key}.ply"
-            output_path.write_bytes(result)
             self.echo(f"Saved {prompt_key}.ply to {output_path}")
 
     async def _generate_with_retries(
@@ -152,16 +162,18 @@ class Generator:
         *,
         image: bytes,
         prompt_key: str,
-    ) -> bytes | None:
+        output_path: Path,
+    ) -> int | None:
         """
         Generates a 3D model from an image using the Targon container with retries.
 
         Args:
             image: Image bytes to process
             prompt_key: Unique identifier for the prompt
+            output_path: Path where the generated .ply file is saved
 
         Returns:
-            Generated model bytes, or None if all attempts failed
+            Size of the saved model in bytes, or None if all attempts failed
 
         Raises:
             RuntimeError: If all retry attempts fail
@@ -184,6 +196,7 @@ class Generator:
             result = await self._generate_attempt(
                 image=image,
                 prompt_key=prompt_key,
+                output_path=output_path,
             )
 
             if result is not None:  # None means retryable failure — continue to next attempt
@@ -196,7 +209,8 @@ class Generator:
         *,
         image: bytes,
         prompt_key: str,
-    ) -> bytes | None:
+        output_path: Path,
+    ) -> int | None:
         """
         Single generation attempt.
         Gets an available endpoint from the queue, uses it, then returns it to the queue.
@@ -204,9 +218,10 @@ class Generator:
         Args:
             image: Image bytes to process
             prompt_key: Unique identifier for the prompt
+            output_path: Path where the generated .ply file is saved
 
         Returns:
-            Generated model bytes, or None if the attempt failed
+            Size of the saved model in bytes, or None if the attempt failed
         """
         # Wait for an available endpoint (blocks until one is free)
         endpoint = await self.endpoint_queue.get()
@@ -216,41 +231,78 @@ class Generator:
         self.echo(f"Prompt {prompt_key} → endpoint port {port} (acquired)")
 
         try:
-            timeout = httpx.Timeout(connect=30.0, read=300.0, write=30.0, pool=30.0)
-            async with httpx.AsyncClient(timeout=timeout) as client:
-                try:
-                    start_time = asyncio.get_running_loop().time()
-                    async with client.stream(
-                        "POST",
-                        f"{endpoint}/generate",
-                        files={"prompt_image_file": ("prompt.jpg", image, "image/jpeg")},
-                        data={"seed": self.seed},
-                    ) as response:
-                        response.raise_for_status()
-
-                        elapsed = asyncio.get_running_loop().time() - start_time
-                        self.echo(f"Prompt {prompt_key} [port {port}] generation completed in {elapsed:.1f}s")
-
-                        try:
-                            content = await response.aread()
-                        except Exception as e:
-                            self.echo(f"Prompt {prompt_key} [port {port}] download failed: {e}")
-                            return None
-
-                        download_time = asyncio.get_running_loop().time() - start_time - elapsed
-                        mb_size = len(content) / 1024 / 1024
-                        self.echo(
-                            f"Prompt {prompt_key} [port {port}] generated in {elapsed:.1f}s, "
-                            f"downloaded in {download_time:.1f}s, {mb_size:.1f} MiB"
-                        )
-
-                        return content
-
-                except Exception as e:
-                    self.echo(f"Prompt {prompt_key} [port {port}] generation failed: {e}")
-                    return None
+            try:
+                start_time = asyncio.get_running_loop().time()
+                async with self.generate_client.stream(
+                    "POST",
+                    f"{endpoint}/generate",
+                    files={"prompt_image_file": ("prompt.jpg", image, "image/jpeg")},
+                    data={"seed": self.seed},
+                ) as response:
+                    response.raise_for_status()
+
+                    elapsed = asyncio.get_running_loop().time() - start_time
+                    self.echo(f"Prompt {prompt_key} [port {port}] generation completed in {elapsed:.1f}s")
+
+                    try:
+                        size = await self._stream_to_file(response, output_path)
+                    except Exception as e:
+                        self.echo(f"Prompt {prompt_key} [port {port}] download failed: {e}")
+                        return None
+
+                    download_time = asyncio.get_running_loop().time() - start_time - elapsed
+                    mb_size = size / 1024 / 1024
+                    self.echo(
+                        f"Prompt {prompt_key} [port {port}] generated in {elapsed:.1f}s, "
+                        f"downloaded in {download_time:.1f}s, {mb_size:.1f} MiB"
+                    )
+
+                    return size
+
+            except Exception as e:
+                self.echo(f"Prompt {prompt_key} [port {port}] generation failed: {e}")
+                return None
 
         finally:
             # Always return the endpoint to the queue so it can be reused
             await self.endpoint_queue.put(endpoint)
             self.echo(f"Prompt {prompt_key} → endpoint port {port} (released)")
+
+    async def _stream_to_file(self, response: httpx.Response, output_path: Path) -> int:
+        """
+        Streams a response body to disk chunk by chunk instead of holding it in memory.
+        The body goes to a temporary file that replaces output_path only once it is complete.
+
+        Args:
+            response: Streaming response whose body is saved
+            output_path: Path where the body is saved
+
+        Returns:
+            Number of bytes written
+        """
+        part_path = output_path.with_name(f"{output_path.name}.part")
+        try:
+            f = await asyncio.to_thread(part_path.open, "wb")
+            try:
+                size = 0
+                # Chunks are handed to the writer thread in batches to limit thread hand-offs
+                batch: list[bytes] = []
+                batch_size = 0
+                async for chunk in response.aiter_bytes(1 << 20):
+                    batch.append(chunk)
+                    batch_size += len(chunk)
+                    if batch_size >= 8 << 20:
+                        await asyncio.to_thread(f.writelines, batch)
+                        size += batch_size
+                        batch, batch_size = [], 0
+                if batch:
+                    await asyncio.to_thread(f.writelines, batch)
+                    size += batch_size
+            finally:
+                await asyncio.to_thread(f.close)
+            await asyncio.to_thread(part_path.replace, output_path)
+        except BaseException:
+            # Never leave a partial file behind, including on cancellation
+            part_path.unlink(missing_ok=True)
+            raise
+        return size
@@ -1,9 +1,10 @@
+import os
 from pathlib import Path
-from pybase64 import b64encode
+from pybase64 import b64encode_as_string
 import httpx
 import click
 import asyncio
-import json
+import orjson
 from pydantic import BaseModel, Field
 from typing import Literal
 from openai import AsyncOpenAI
@@ -36,6 +37,17 @@ class JudgeResponse(BaseModel):
     """Human-readable issue summary produced by the judge."""
 
 
+# Request parts that are the same for every judge call, built once instead of per call
+SYSTEM_MESSAGE = {"role": "system", "content": SYSTEM_PROMPT}
+RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "judge-response",
+        "schema": JudgeResponse.model_json_schema(),
+    },
+}
+
+
 class DuelResult(BaseModel):
     """Result of a position-balanced duel evaluation."""
 
@@ -53,6 +65,7 @@ class Judge:
         temperature: float,
         max_tokens: int,
         timeout: float,
+        max_concurrency: int = 4,
     ) -> None:
         self.endpoint = endpoint
         self.model = model
@@ -60,6 +73,10 @@ class Judge:
         self.temperature = temperature
         self.max_tokens = max_tokens
         self.timeout = timeout
+        self.max_concurrency = max_concurrency
+        # Clients shared by all prompts of a judge run, so their connections are reused
+        self.http_client: httpx.AsyncClient | None = None
+        self.openai_client: AsyncOpenAI | None = None
 
     async def judge(self, prompt_file: Path, image_dir_1: Path, image_dir_2: Path, output_file: Path) -> None:
         # Validate all paths exist
@@ -75,19 +92,27 @@ class Judge:
             raise FileNotFoundError(f"Image directory {image_dir_1} does not exist")
         if not image_dir_1.is_dir():
             raise ValueError(f"Image directory {image_dir_1} is not a directory")
-        prompt_to_file_1 = {image_file.name.split(".")[0]: image_file for image_file in image_dir_1.glob("*.png")}
+        with os.scandir(image_dir_1) as it:
+            prompt_to_file_1 = {e.name.split(".")[0]: Path(e.path) for e in it if e.name.endswith(".png") and e.is_file()}
         
         if not image_dir_2.exists():
             raise FileNotFoundError(f"Image directory {image_dir_2} does not exist")
         if not image_dir_2.is_dir():
             raise ValueError(f"Image directory {image_dir_2} is not a directory")
-        prompt_to_file_2 = {image_file.name.split(".")[0]: image_file for image_file in image_dir_2.glob("*.png")}
+        with os.scandir(image_dir_2) as it:
+            prompt_to_file_2 = {e.name.split(".")[0]: Path(e.path) for e in it if e.name.endswith(".png") and e.is_file()}
         
         tasks = []
         prompt_keys = []  # Track which prompt key corresponds to each task
+        # Pool sized to request_sem below, which caps concurrent prompt downloads at 8
+        self.http_client = httpx.AsyncClient(
+            timeout=self.timeout,
+            limits=httpx.Limits(max_keepalive_connections=8, max_connections=8),
+        )
+        self.openai_client = self._create_openai_client()
         try:
-            request_sem = asyncio.Semaphore(8)  # Using semaphores to limit request to one at a time.
-            process_sem = asyncio.Semaphore(1)  # Limiting request to control traffic
+            request_sem = asyncio.Semaphore(8)  # Limits concurrent prompt image downloads
+            process_sem = asyncio.Semaphore(self.max_concurrency)  # Limits concurrent judge VLM calls
             for prompt in prompt_to_url:
                 if prompt not in prompt_to_file_1 or prompt not in prompt_to_file_2:
                     click.echo(f"No files for prompt {prompt} found in image directories", err=True)
@@ -129,24 +154,24 @@ class Judge:
             
             # Save results to JSON file
             output_file.parent.mkdir(parents=True, exist_ok=True)
-            with open(output_file, "w") as f:
-                json.dump(duel_results, f, indent=2)
+            output_file.write_bytes(orjson.dumps(duel_results, option=orjson.OPT_INDENT_2))
             click.echo(f"Saved {len(duel_results)} duel results to {output_file}", err=True)
             
         except (KeyboardInterrupt, asyncio.CancelledError):
             click.echo("\nInterrupted by user. Cancelling tasks and cleaning up...", err=True)
-            # Cancel all running tasks
-            for task in tasks:
-                if not task.done():
-                    task.cancel()
-            # Wait for tasks to be cancelled
-            if tasks:
-                await asyncio.gather(*tasks, return_exceptions=True)
+            # Cancel the tasks that are still running and wait only for those to unwind
+            pending = [task for task in tasks if not task.done()]
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
             raise
         except Exception as e:
             click.echo(f"Generation failed: {e}", err=True)
             raise
         finally:
+            await self.http_client.aclose()
+            await self.openai_client.close()
             click.echo("Generation completed", err=True)
 
     async def _process_prompt(
@@ -159,28 +184,33 @@ class Judge:
         file_1: Path,
         file_2: Path,
     ) -> DuelResult:
-        try:
-            # Get prompt image
+        async def _get_prompt_image() -> bytes:
             async with request_sem:
                 click.echo(f"Requesting prompt {prompt_url}...", err=True)
-                response = await httpx.AsyncClient().get(prompt_url)
+                response = await self.http_client.get(prompt_url)
                 response.raise_for_status()
-                prompt_image = response.content
+                return response.content
 
-            # Get file 1 image
-            with open(file_1, "rb") as f:
-                file_1_image = f.read()
-            # Get file 2 image
-            with open(file_2, "rb") as f:
-                file_2_image = f.read()
+        try:
+            # Download the prompt image while both model images are read off the event loop
+            prompt_image, file_1_image, file_2_image = await asyncio.gather(
+                _get_prompt_image(),
+                asyncio.to_thread(file_1.read_bytes),
+                asyncio.to_thread(file_2.read_bytes),
+            )
             
-            client = self._create_openai_client()
+            client = self.openai_client
             click.echo(f"Processing prompt {prompt_name}...", err=True)
+
+            # Both calls of the duel send the same three images, so each is encoded only once
+            prompt_img_b64 = b64encode_as_string(prompt_image)
+            file_1_img_b64 = b64encode_as_string(file_1_image)
+            file_2_img_b64 = b64encode_as_string(file_2_image)
             
             # Run position-balanced duel (two calls with swapped order)
             result_1, result_2 = await asyncio.gather(
-                self.ask_judge(process_sem, client, prompt_name, prompt_image, file_1_image, file_2_image, self.seed),
-                self.ask_judge(process_sem, client, prompt_name, prompt_image, file_2_image, file_1_image, self.seed),
+                self.ask_judge(process_sem, client, prompt_name, prompt_img_b64, file_1_img_b64, file_2_img_b64, self.seed),
+                self.ask_judge(process_sem, client, prompt_name, prompt_img_b64, file_2_img_b64, file_1_img_b64, self.seed),
             )
             
             # Calculate average penalties (position-balanced)
@@ -211,9 +241,9 @@ class Judge:
         process_sem: asyncio.Semaphore,
         client: AsyncOpenAI,
         prompt_name: str,
-        prompt_image: bytes,
-        left_image: bytes,
-        right_image: bytes,
+        prompt_img_b64: str,
+        left_img_b64: str,
+        right_img_b64: str,
         seed: int,
     ) -> JudgeResponse:
         """Ask the judge to evaluate two models against a prompt image.
@@ -222,22 +252,17 @@ class Judge:
             process_sem: Semaphore to control concurrent processing
             client: OpenAI client instance
             prompt_name: Name/key of the prompt
-            prompt_image: Bytes of the prompt image
-            left_image: Bytes of the first model image (4 views)
-            right_image: Bytes of the second model image (4 views)
+            prompt_img_b64: Base64-encoded prompt image
+            left_img_b64: Base64-encoded first model image (4 views)
+            right_img_b64: Base64-encoded second model image (4 views)
             seed: Random seed for reproducibility
             
         Returns:
             JudgeResponse with penalties and issues
         """
         async with process_sem:
-            # Encode images as base64
-            prompt_img_b64 = b64encode(prompt_image).decode("utf-8")
-            left_img_b64 = b64encode(left_image).decode("utf-8")
-            right_img_b64 = b64encode(right_image).decode("utf-8")
-            
             messages = [
-                {"role": "system", "content": SYSTEM_PROMPT},
+                SYSTEM_MESSAGE,
                 {
                     "role": "user",
                     "content": [
@@ -260,20 +285,12 @@ class Judge:
                     ],
                 },
             ]
-            response_format = {
-                "type": "json_schema",
-                "json_schema": {
-                    "name": "judge-response",
-                    "schema": JudgeResponse.model_json_schema(),
-                },
-            }
-
             completion = await client.chat.completions.create(
                 model=self.model,
                 messages=messages,
                 temperature=self.temperature,
                 max_tokens=self.max_tokens,
-                response_format=response_format,
+                response_format=RESPONSE_FORMAT,
                 seed=seed,
             )
 
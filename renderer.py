@@ -1,5 +1,5 @@
 import asyncio
-import json
+import io
 from loguru import logger
 import click
 import httpx
@@ -8,73 +8,93 @@ from pathlib import Path
 
 
 class Renderer:
-    def __init__(self, *, endpoint: str, data_dir: str, output_dir: str) -> None:
+    def __init__(
+        self,
+        *,
+        endpoint: str,
+        data_dir: str,
+        output_dir: str,
+        max_concurrency: int = 1,
+        r2_client=None,
+        r2_bucket: str | None = None,
+        r2_prefix: str = "",
+    ) -> None:
         self._endpoint = endpoint
+        self._ply_url = f"{endpoint}/render_ply"
+        self._glb_url = f"{endpoint}/render_glb"
+        self._timeout = httpx.Timeout(connect=300.0, read=300.0, write=300.0, pool=300.0)
+        self._max_concurrency = max_concurrency
         self._data_dir = Path(data_dir)
         self._output_dir = Path(output_dir)
-        self._output_dir.mkdir(parents=True, exist_ok=True)
+        # With an R2 client and bucket, rendered images are uploaded from memory instead of written to output_dir
+        self._r2_client = r2_client if r2_bucket else None
+        self._r2_bucket = r2_bucket
+        self._r2_prefix = f"{r2_prefix.rstrip('/')}/" if r2_prefix else ""
+        if self._r2_client is None:
+            self._output_dir.mkdir(parents=True, exist_ok=True)
 
     async def render(self) -> None:
         """Render the .ply and .glb files using the renderer endpoint."""
         click.echo(f"Rendering {self._data_dir} with endpoint {self._endpoint}", err=True)
         tasks: list[asyncio.Task] = []
-        try:
-            process_sem = asyncio.Semaphore(1)
-            # Collect both .ply and .glb files
-            ply_files = list(self._data_dir.glob("*.ply"))
-            glb_files = list(self._data_dir.glob("*.glb"))
-            all_files = ply_files + glb_files
-            tasks = [
-                asyncio.create_task(
-                    self._process_prompt(
-                        process_sem=process_sem,
-                        file=file
+        # One pooled client for every file, so requests to the renderer reuse their connections
+        limits = httpx.Limits(max_connections=self._max_concurrency, max_keepalive_connections=self._max_concurrency)
+        async with httpx.AsyncClient(timeout=self._timeout, limits=limits) as client:
+            try:
+                process_sem = asyncio.Semaphore(self._max_concurrency)
+                # Collect both .ply and .glb files; nothing else becomes a task
+                ply_files = list(self._data_dir.glob("*.ply"))
+                glb_files = list(self._data_dir.glob("*.glb"))
+                all_files = ply_files + glb_files
+                tasks = [
+                    asyncio.create_task(
+                        self._process_prompt(
+                            process_sem=process_sem,
+                            client=client,
+                            file=file
+                        )
                     )
-                )
-                for file in all_files
-            ]
-            await asyncio.gather(*tasks, return_exceptions=True)
-        except KeyboardInterrupt:
-            for task in tasks:
-                if not task.done():
-                    task.cancel()
-            await asyncio.gather(*tasks, return_exceptions=True)
-            raise SystemExit(130)
-        except Exception as e:
-            logger.error(f"Renderer failed: {e}")
-            click.echo(json.dumps({"success": False, "error": str(e)}))
-            raise SystemExit(1)
+                    for file in all_files
+                ]
+                await asyncio.gather(*tasks, return_exceptions=True)
+            except KeyboardInterrupt:
+                for task in tasks:
+                    if not task.done():
+                        task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+                raise SystemExit(130)
+            except Exception as e:
+                click.echo(f"Rendering failed: {e}", err=True)
+                raise
 
-    async def _process_prompt(self, *, process_sem: asyncio.Semaphore, file: Path) -> None:
+    async def _process_prompt(self, *, process_sem: asyncio.Semaphore, client: httpx.AsyncClient, file: Path) -> None:
         """Render the .ply or .glb files using the renderer endpoint."""
         async with process_sem:
             click.echo(f"Rendering {file}...", err=True)
             try:
-                timeout = httpx.Timeout(connect=300.0, read=300.0, write=300.0, pool=300.0)
-                async with httpx.AsyncClient(timeout=timeout) as client:
-                    try:
-                        with open(file, "rb") as f:
-                            file_contents = f.read()
-                        if file.name.endswith(".ply"):
-                            endpoint = f"{self._endpoint}/render_ply" 
-                        elif file.name.endswith(".glb"):
-                            endpoint = f"{self._endpoint}/render_glb"
-                        else:
-                            raise ValueError(f"Unsupported file type: {file.name}")
-                        response = await client.post(
-                            endpoint,
-                            files={"file": (file.name, file_contents, "application/octet-stream")},
-                        )
-                        response.raise_for_status()
-                        content = response.content
-                        output_file = self._output_dir / f"{file.name.split('.')[0]}.png"
-                        with open(output_file, "wb") as f:
-                            f.write(content)
-                        click.echo(f"Rendered {file.name} to {output_file}", err=True)
-                    except Exception as e:
-                        logger.error(f"Renderer failed for file {file}: {e}")
-                        click.echo(f"Renderer failed for file {file}: {e}", err=True)
+                endpoint = self._ply_url if file.suffix == ".ply" else self._glb_url
+                # httpx streams an open file into the multipart body chunk by chunk instead of holding all of it
+                with open(file, "rb") as f:
+                    response = await client.post(
+                        endpoint,
+                        files={"file": (file.name, f, "application/octet-stream")},
+                    )
+                response.raise_for_status()
+                content = response.content
+                if self._r2_client is not None:
+                    object_name = f"{self._r2_prefix}{file.stem}.png"
+                    await asyncio.to_thread(
+                        self._r2_client.upload_fileobj,
+                        io.BytesIO(content),
+                        self._r2_bucket,
+                        object_name,
+                        ExtraArgs={"ContentType": "image/png"},
+                    )
+                    click.echo(f"Rendered {file.name} to r2://{self._r2_bucket}/{object_name}", err=True)
+                    return
+                output_file = self._output_dir / f"{file.stem}.png"
+                await asyncio.to_thread(output_file.write_bytes, content)
+                click.echo(f"Rendered {file.name} to {output_file}", err=True)
             except Exception as e:
-                logger.error(f"Renderer failed: {e}")
-                click.echo(json.dumps({"success": False, "error": str(e)}), err=True)
-                raise SystemExit(1)
+                logger.error(f"Renderer failed for file {file}: {e}")
+                click.echo(f"Renderer failed for file {file}: {e}", err=True)
@@ -1,3 +1,4 @@
+import asyncio
 from types import TracebackType
 from typing import Self
 
@@ -119,11 +120,20 @@ class TargonClient:
             if raise_on_failure:
                 raise TargonClientError(f"Failed to delete container: {e}") from e
 
+    async def _delete_all(self, containers: list[ServerlessResourceListItem], max_concurrency: int = 10) -> None:
+        """Delete the containers concurrently, with at most max_concurrency requests in flight."""
+        sem = asyncio.Semaphore(max_concurrency)
+
+        async def _delete(uid: str) -> None:
+            async with sem:
+                await self.delete_container(uid)
+
+        await asyncio.gather(*(_delete(c.uid) for c in containers), return_exceptions=True)
+
     async def delete_containers_by_name(self, name: str) -> int:
         """Delete all containers with the exact name. Returns count deleted."""
         containers = await self.list_containers(name=name)
-        for c in containers:
-            await self.delete_container(c.uid)
+        await self._delete_all(containers)
         return len(containers)
 
     async def delete_containers_by_prefix(self, prefix: str) -> int:
@@ -134,8 +144,7 @@ class TargonClient:
         miner-5-5e7eserr2a, miner-5-abc1234567, etc.
         """
         containers = await self.list_containers(prefix=prefix)
-        for c in containers:
-            await self.delete_container(c.uid)
+        await self._delete_all(containers)
         if containers:
             logger.info(f"Deleted {len(containers)} containers matching prefix '{prefix}'")
         return len(containers)
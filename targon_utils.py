@@ -1,4 +1,5 @@
 import asyncio
+import random
 from typing import Callable
 
 import httpx
@@ -16,6 +17,12 @@ def _log(msg: str, echo: Callable[[str], None] | None, level: str = "info") -> N
         getattr(logger, level)(msg)
 
 
+def _backoff_delay(attempt: int, check_interval: float) -> float:
+    """Exponential delay from 1s up to check_interval, with +/-25% jitter so parallel waiters do not poll in lockstep."""
+    # The exponent is capped so long waits cannot overflow the float once the delay has reached check_interval
+    return min(check_interval, 2.0 ** min(attempt, 16)) * random.uniform(0.75, 1.25)
+
+
 async def wait_for_visible(
     client: TargonClient,
     name: str,
@@ -28,21 +35,16 @@ async def wait_for_visible(
     Wait for the container to become visible (stage 1).
     Targon containers may not appear immediately after deployment.
     """
-    deadline = asyncio.get_running_loop().time() + timeout
-
-    start = asyncio.get_running_loop().time()
-    time_elapsed = asyncio.get_running_loop().time() - start
-    while time_elapsed < timeout:
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    attempt = 0
+    while loop.time() < deadline:
         container = await client.get_container(name)
         if container and container.url:
             return container
 
-        if asyncio.get_running_loop().time() >= deadline:
-            _log(f"Container {name} not visible within {timeout}s", echo, "warning")
-            return None
-
-        await asyncio.sleep(check_interval)
-        time_elapsed = asyncio.get_running_loop().time() - start
+        await asyncio.sleep(_backoff_delay(attempt, check_interval))
+        attempt += 1
 
     _log(f"Container {name} not visible within {timeout}s. Timeout reached.", echo, "warning")
     return None
@@ -63,20 +65,28 @@ async def wait_for_healthy(
     else:
         health_url = f"{url}{health_check_path}"
 
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    deadline = start + timeout
+    # Probe with HEAD to skip the response body; servers that reject it with 405 are probed with GET from then on
+    method = "HEAD"
+    attempt = 0
     async with httpx.AsyncClient(timeout=30.0) as http:
-        start = asyncio.get_running_loop().time()
-        time_elapsed = asyncio.get_running_loop().time() - start
-        while time_elapsed < timeout:
+        while loop.time() < deadline:
             try:
-                response = await http.get(health_url)
-                response.raise_for_status()
+                response = await http.request(method, health_url)
+                if response.status_code == 405 and method == "HEAD":
+                    method = "GET"
+                    response = await http.request(method, health_url)
                 if response.status_code == 200:
                     _log(f"Container at {url} healthy", echo, "info")  
                     return True
-            except Exception as e:
-                _log(f"Container not ready yet: {time_elapsed:.1f}/{timeout:.1f}s", echo, "info")
-                await asyncio.sleep(check_interval)
-                time_elapsed = asyncio.get_running_loop().time() - start
+            except Exception:
+                pass
+            # Wait before every retry, including non-error statuses other than 200
+            _log(f"Container not ready yet: {loop.time() - start:.1f}/{timeout:.1f}s", echo, "info")
+            await asyncio.sleep(_backoff_delay(attempt, check_interval))
+            attempt += 1
     _log(f"Container at {url} not healthy within {timeout}s. Timeout reached.", echo, "error")
     return False
 
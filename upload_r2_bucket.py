@@ -7,11 +7,34 @@ Cloudflare R2 is S3-compatible, so we use boto3.
 import os
 import sys
 import argparse
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 import boto3
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
 from botocore.exceptions import ClientError
 from tqdm import tqdm
 
+# Number of files uploaded at once
+MAX_WORKERS = 32
+
+# Parts of one large file sent at once; kept small because MAX_WORKERS files are already in flight
+PART_CONCURRENCY = 4
+
+# Large files are sent as 16 MiB parts, up to PART_CONCURRENCY at a time per file
+TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=16 * 1024 * 1024,
+    multipart_chunksize=16 * 1024 * 1024,
+    max_concurrency=PART_CONCURRENCY,
+    use_threads=True
+)
+
+# Every file worker can have all of its parts in flight, so the pool holds a connection for each
+MAX_POOL_CONNECTIONS = MAX_WORKERS * PART_CONCURRENCY
+
+# CRC32 is checksummed by zlib while the body is sent; CRC32C would need the optional awscrt package
+UPLOAD_EXTRA_ARGS = {'ChecksumAlgorithm': 'CRC32'}
+
 
 def get_r2_client(account_id, access_key_id, secret_access_key):
     """
@@ -32,7 +55,8 @@ def get_r2_client(account_id, access_key_id, secret_access_key):
         endpoint_url=endpoint_url,
         aws_access_key_id=access_key_id,
         aws_secret_access_key=secret_access_key,
-        region_name='auto'  # R2 uses 'auto' as region
+        region_name='auto',  # R2 uses 'auto' as region
+        config=Config(max_pool_connections=MAX_POOL_CONNECTIONS)
     )
     
     return s3_client
@@ -55,14 +79,20 @@ def upload_file(s3_client, file_path, bucket_name, object_name=None):
         object_name = os.path.basename(file_path)
     
     try:
-        s3_client.upload_file(file_path, bucket_name, object_name)
+        s3_client.upload_file(
+            file_path,
+            bucket_name,
+            object_name,
+            ExtraArgs=UPLOAD_EXTRA_ARGS,
+            Config=TRANSFER_CONFIG
+        )
     except ClientError as e:
         print(f"Error uploading {file_path}: {e}")
         return False
     return True
 
 
-def upload_folder(s3_client, folder_path, bucket_name, prefix=""):
+def upload_folder(s3_client, folder_path, bucket_name, prefix="", max_workers=MAX_WORKERS):
     """
     Upload an entire folder to R2 bucket, preserving directory structure.
     
@@ -71,6 +101,7 @@ def upload_folder(s3_client, folder_path, bucket_name, prefix=""):
         folder_path: Path to folder to upload
         bucket_name: Name of the R2 bucket
         prefix: Prefix to prepend to object names (folder path in bucket)
+        max_workers: Number of files uploaded concurrently
     
     Returns:
         Tuple of (successful_uploads, failed_uploads)
@@ -85,12 +116,9 @@ def upload_folder(s3_client, folder_path, bucket_name, prefix=""):
         print(f"Error: {folder_path} is not a directory")
         return 0, 0
     
-    # Collect all files to upload
-    files_to_upload = []
-    for root, dirs, files in os.walk(folder_path):
-        for file in files:
-            file_path = Path(root) / file
-            files_to_upload.append(file_path)
+    # Collect all files to upload; the absolute folder path makes every result start with it
+    folder_path = folder_path.absolute()
+    files_to_upload = [p for p in folder_path.rglob('*') if p.is_file()]
     
     if not files_to_upload:
         print(f"No files found in {folder_path}")
@@ -101,24 +129,29 @@ def upload_folder(s3_client, folder_path, bucket_name, prefix=""):
     successful = 0
     failed = 0
     
-    # Upload files with progress bar
-    for file_path in tqdm(files_to_upload, desc="Uploading files"):
-        # Calculate relative path from base folder
-        relative_path = file_path.relative_to(folder_path)
-        
-        # Create object name with prefix
-        if prefix:
-            object_name = f"{prefix.rstrip('/')}/{relative_path}"
-        else:
-            object_name = str(relative_path)
-        
-        # Convert Windows paths to forward slashes for S3
-        object_name = object_name.replace('\\', '/')
+    # Relative paths are sliced off the known folder prefix instead of calling relative_to per file
+    prefix_len = len(os.path.join(str(folder_path), ''))
+    object_prefix = f"{prefix.rstrip('/')}/" if prefix else ""
+    
+    # Upload files concurrently; boto3 clients are safe to share between threads
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = []
+        for file_path in files_to_upload:
+            file_path = str(file_path)
+            
+            # Create object name with prefix, converting Windows paths to forward slashes for S3
+            object_name = object_prefix + file_path[prefix_len:].replace('\\', '/')
+            
+            futures.append(executor.submit(upload_file, s3_client, file_path, bucket_name, object_name))
         
-        if upload_file(s3_client, str(file_path), bucket_name, object_name):
-            successful += 1
-        else:
-            failed += 1
+        # Update the progress bar as uploads finish, in completion order; skip rendering it when stderr is not a terminal
+        with tqdm(total=len(futures), desc="Uploading files", unit="file", disable=not sys.stderr.isatty()) as pbar:
+            for future in as_completed(futures):
+                if future.result():
+                    successful += 1
+                else:
+                    failed += 1
+                pbar.update(1)
     
     return successful, failed
 